@@ -6,6 +6,7 @@ Telegram Bot for Google Cloud Cluster and Billing Information
 import os
 import logging
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 from dotenv import load_dotenv
@@ -29,20 +30,48 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+MAIN_MENU_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📊 Clusters", callback_data="clusters")],
+    [InlineKeyboardButton("💰 Billing", callback_data="billing")],
+    [InlineKeyboardButton("🖥️ Nodes", callback_data="nodes")],
+    [InlineKeyboardButton("📈 Costs", callback_data="costs")],
+    [InlineKeyboardButton("🔍 Status", callback_data="status")]
+])
+
 class TelegramBot:
     def __init__(self):
         self.token = os.getenv('TELEGRAM_BOT_TOKEN')
         if not self.token:
             raise ValueError("TELEGRAM_BOT_TOKEN environment variable is required")
         
-        self.allowed_users = os.getenv('ALLOWED_TELEGRAM_USERS', '').split(',')
+        # Parse the allow-list once, dropping whitespace and empty entries; None means no restriction
+        raw_allowed_users = os.getenv('ALLOWED_TELEGRAM_USERS', '')
+        self.allowed_users: Optional[frozenset] = None
+        if raw_allowed_users:
+            self.allowed_users = frozenset(
+                user_id.strip() for user_id in raw_allowed_users.split(',') if user_id.strip()
+            )
+            if not self.allowed_users:
+                logger.warning("ALLOWED_TELEGRAM_USERS is set but contains no user IDs; denying all users")
         self.gcloud_client = GCloudClient()
         self.handlers = BotHandlers(self.gcloud_client)
         
-        # Initialize bot application
-        self.application = Application.builder().token(self.token).build()
+        # Initialize bot application; updates are handled concurrently over the bot's shared HTTP pool
+        self.application = (
+            Application.builder()
+            .token(self.token)
+            .concurrent_updates(True)
+            .post_init(self._post_init)
+            .build()
+        )
         self._setup_handlers()
     
+    async def _post_init(self, application: Application):
+        """Bound the executor used to offload blocking Google Cloud calls"""
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=4, thread_name_prefix='gcloud')
+        )
+    
     def _setup_handlers(self):
         """Setup all bot command and callback handlers"""
         # Command handlers
@@ -67,9 +96,9 @@ class TelegramBot:
             return
         
         welcome_text = (
-            "🚀 **Welcome to the Google Cloud Monitor Bot!**\n\n"
+            "🚀 <b>Welcome to the Google Cloud Monitor Bot!</b>\n\n"
             "I can help you monitor your GCP clusters and billing information.\n\n"
-            "**Available Commands:**\n"
+            "<b>Available Commands:</b>\n"
             "/clusters - List all GKE clusters\n"
             "/billing - Show billing overview\n"
             "/nodes - Show cluster node information\n"
@@ -79,16 +108,7 @@ class TelegramBot:
             "Use /help for more detailed information."
         )
         
-        keyboard = [
-            [InlineKeyboardButton("📊 Clusters", callback_data="clusters")],
-            [InlineKeyboardButton("💰 Billing", callback_data="billing")],
-            [InlineKeyboardButton("🖥️ Nodes", callback_data="nodes")],
-            [InlineKeyboardButton("📈 Costs", callback_data="costs")],
-            [InlineKeyboardButton("🔍 Status", callback_data="status")]
-        ]
-        reply_markup = InlineKeyboardMarkup(keyboard)
-        
-        await update.message.reply_text(welcome_text, reply_markup=reply_markup, parse_mode='Markdown')
+        await update.message.reply_text(welcome_text, reply_markup=MAIN_MENU_KEYBOARD, parse_mode='HTML')
     
     async def _help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /help command"""
@@ -97,25 +117,25 @@ class TelegramBot:
             return
         
         help_text = (
-            "🔧 **Bot Help & Commands**\n\n"
-            "**Cluster Management:**\n"
-            "• `/clusters` - List all GKE clusters with status\n"
-            "• `/nodes` - Show detailed node information\n"
-            "• `/status` - Overall system health status\n\n"
-            "**Billing & Costs:**\n"
-            "• `/billing` - Current billing overview\n"
-            "• `/costs` - Detailed cost analysis and trends\n\n"
-            "**Interactive Features:**\n"
+            "🔧 <b>Bot Help &amp; Commands</b>\n\n"
+            "<b>Cluster Management:</b>\n"
+            "• <code>/clusters</code> - List all GKE clusters with status\n"
+            "• <code>/nodes</code> - Show detailed node information\n"
+            "• <code>/status</code> - Overall system health status\n\n"
+            "<b>Billing &amp; Costs:</b>\n"
+            "• <code>/billing</code> - Current billing overview\n"
+            "• <code>/costs</code> - Detailed cost analysis and trends\n\n"
+            "<b>Interactive Features:</b>\n"
             "• Use inline buttons for quick access\n"
             "• Get real-time cluster status updates\n"
             "• Monitor billing alerts and thresholds\n\n"
-            "**Examples:**\n"
-            "• `/clusters` - See all your clusters\n"
-            "• `/billing` - Check current month costs\n"
-            "• `/costs` - Analyze spending patterns"
+            "<b>Examples:</b>\n"
+            "• <code>/clusters</code> - See all your clusters\n"
+            "• <code>/billing</code> - Check current month costs\n"
+            "• <code>/costs</code> - Analyze spending patterns"
         )
         
-        await update.message.reply_text(help_text, parse_mode='Markdown')
+        await update.message.reply_text(help_text, parse_mode='HTML')
     
     async def _clusters_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /clusters command"""
@@ -179,7 +199,7 @@ class TelegramBot:
     
     def _is_user_authorized(self, user_id: int) -> bool:
         """Check if user is authorized to use the bot"""
-        if not self.allowed_users or self.allowed_users == ['']:
+        if self.allowed_users is None:
             return True  # Allow all users if no restrictions set
         return str(user_id) in self.allowed_users
     
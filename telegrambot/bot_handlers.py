@@ -3,14 +3,81 @@
 Bot Handlers for Processing User Commands and Formatting Responses
 """
 
+import asyncio
+import html
 import logging
-from typing import Dict, List, Any
+from typing import List, Mapping, Tuple, Any
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
-from gcloud_client import GCloudClient
+from gcloud_client import ClusterInfo, GCloudClient
 
 logger = logging.getLogger(__name__)
 
+STATUS_EMOJI = {
+    'RUNNING': '🟢',
+    'PROVISIONING': '🟡',
+    'STOPPING': '🟠',
+    'ERROR': '🔴',
+    'DEGRADED': '🟡'
+}
+
+# Per-item message templates, filled with str.format_map
+CLUSTER_ENTRY_TEMPLATE = (
+    "{index}. <b>{name}</b> {status_emoji}\n"
+    "   📍 Location: <code>{location}</code>\n"
+    "   🚀 Status: <code>{status}</code>\n"
+    "   🔢 Version: <code>{version}</code>\n"
+    "   🖥️ Nodes: <code>{node_count}</code>\n"
+    "   🌐 Network: <code>{network}</code>\n"
+    "   📅 Created: <code>{created_at}</code>\n\n"
+)
+NODE_POOL_ENTRY_TEMPLATE = (
+    "  {index}. <b>{name}</b> {status_emoji}\n"
+    "     🔢 Version: <code>{version}</code>\n"
+    "     🚦 Status: <code>{status}</code>\n"
+    "     🖥️ Node Count: <code>{node_count}</code>\n"
+    "     💻 Machine Type: <code>{machine_type}</code>\n"
+    "     💾 Disk Size: <code>{disk_size_gb} GB</code>\n"
+    "     🖼️ Image Type: <code>{image_type}</code>\n"
+)
+
+class HtmlTemplateFields(dict):
+    """Template mapping that HTML-escapes values and renders missing fields as 'Unknown'"""
+    def __getitem__(self, key: str) -> str:
+        return escape_html(super().__getitem__(key))
+    
+    def __missing__(self, key: str) -> str:
+        return 'Unknown'
+
+def escape_html(value: Any) -> str:
+    """Escape a dynamic value for messages sent with parse_mode='HTML'"""
+    return html.escape(str(value))
+
+# Upper bound on node pool requests in flight per command, to stay within GKE API quota
+MAX_CONCURRENT_NODE_REQUESTS = 4
+
+# Inline keyboards are static, so build them once instead of per command
+CLUSTERS_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("🖥️ Node Details", callback_data="nodes")],
+    [InlineKeyboardButton("🔍 Cluster Status", callback_data="status")],
+    [InlineKeyboardButton("💰 Billing Info", callback_data="billing")]
+])
+BILLING_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📊 Clusters", callback_data="clusters")],
+    [InlineKeyboardButton("🖥️ Nodes", callback_data="nodes")],
+    [InlineKeyboardButton("📈 Cost Analysis", callback_data="costs")]
+])
+NODES_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📊 Clusters", callback_data="clusters")],
+    [InlineKeyboardButton("💰 Billing", callback_data="billing")],
+    [InlineKeyboardButton("🔍 Status", callback_data="status")]
+])
+OVERVIEW_KEYBOARD = InlineKeyboardMarkup([
+    [InlineKeyboardButton("📊 Clusters", callback_data="clusters")],
+    [InlineKeyboardButton("💰 Billing", callback_data="billing")],
+    [InlineKeyboardButton("🖥️ Nodes", callback_data="nodes")]
+])
+
 class BotHandlers:
     def __init__(self, gcloud_client: GCloudClient):
         self.gcloud_client = gcloud_client
@@ -22,36 +89,22 @@ class BotHandlers:
             message = await update.effective_message.reply_text("🔍 Fetching cluster information...")
             
             # Get clusters data
-            clusters = self.gcloud_client.get_clusters()
+            clusters = await asyncio.get_running_loop().run_in_executor(None, self.gcloud_client.get_clusters)
             
             if not clusters:
                 await message.edit_text("❌ No clusters found or failed to retrieve cluster information.")
                 return
             
             # Format clusters information
-            clusters_text = "📊 **GKE Clusters Overview**\n\n"
+            clusters_text = "📊 <b>GKE Clusters Overview</b>\n\n"
             
             for i, cluster in enumerate(clusters, 1):
-                status_emoji = self._get_status_emoji(cluster.get('status', 'UNKNOWN'))
-                clusters_text += (
-                    f"{i}. **{cluster.get('name', 'Unknown')}** {status_emoji}\n"
-                    f"   📍 Location: `{cluster.get('location', 'Unknown')}`\n"
-                    f"   🚀 Status: `{cluster.get('status', 'Unknown')}`\n"
-                    f"   🔢 Version: `{cluster.get('version', 'Unknown')}`\n"
-                    f"   🖥️ Nodes: `{cluster.get('node_count', 'Unknown')}`\n"
-                    f"   🌐 Network: `{cluster.get('network', 'Unknown')}`\n"
-                    f"   📅 Created: `{cluster.get('created_at', 'Unknown')}`\n\n"
+                status_emoji = self._get_status_emoji(cluster.status)
+                clusters_text += CLUSTER_ENTRY_TEMPLATE.format_map(
+                    HtmlTemplateFields(cluster._asdict(), index=i, status_emoji=status_emoji)
                 )
             
-            # Add inline buttons for detailed views
-            keyboard = [
-                [InlineKeyboardButton("🖥️ Node Details", callback_data="nodes")],
-                [InlineKeyboardButton("🔍 Cluster Status", callback_data="status")],
-                [InlineKeyboardButton("💰 Billing Info", callback_data="billing")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            await message.edit_text(clusters_text, reply_markup=reply_markup, parse_mode='Markdown')
+            await message.edit_text(clusters_text, reply_markup=CLUSTERS_KEYBOARD, parse_mode='HTML')
             
         except Exception as e:
             logger.error(f"Error handling clusters command: {e}")
@@ -65,53 +118,48 @@ class BotHandlers:
             # Send initial message
             message = await update.effective_message.reply_text("💰 Fetching billing information...")
             
-            # Get billing data
-            billing_info = self.gcloud_client.get_billing_info()
-            project_info = self.gcloud_client.get_project_info()
+            # Get billing and project data concurrently
+            loop = asyncio.get_running_loop()
+            billing_info, project_info = await asyncio.gather(
+                loop.run_in_executor(None, self.gcloud_client.get_billing_info),
+                loop.run_in_executor(None, self.gcloud_client.get_project_info)
+            )
             
             if 'error' in billing_info:
                 await message.edit_text(f"❌ Error retrieving billing information: {billing_info['error']}")
                 return
             
             # Format billing information
-            billing_text = "💰 **Google Cloud Billing Overview**\n\n"
+            billing_text = "💰 <b>Google Cloud Billing Overview</b>\n\n"
             
             # Project information
             if 'error' not in project_info:
                 billing_text += (
-                    f"🏢 **Project Information**\n"
-                    f"   📋 Project ID: `{project_info.get('project_id', 'Unknown')}`\n"
-                    f"   📝 Display Name: `{project_info.get('name', 'Unknown')}`\n"
-                    f"   🚦 State: `{project_info.get('state', 'Unknown')}`\n"
-                    f"   📅 Created: `{project_info.get('created_at', 'Unknown')}`\n\n"
+                    f"🏢 <b>Project Information</b>\n"
+                    f"   📋 Project ID: <code>{escape_html(project_info.get('project_id', 'Unknown'))}</code>\n"
+                    f"   📝 Display Name: <code>{escape_html(project_info.get('name', 'Unknown'))}</code>\n"
+                    f"   🚦 State: <code>{escape_html(project_info.get('state', 'Unknown'))}</code>\n"
+                    f"   📅 Created: <code>{escape_html(project_info.get('created_at', 'Unknown'))}</code>\n\n"
                 )
             
             # Billing information
             billing_text += (
-                f"💳 **Billing Details**\n"
-                f"   🔌 Billing Enabled: `{'Yes' if billing_info.get('billing_enabled') else 'No'}`\n"
-                f"   🏦 Billing Account: `{billing_info.get('billing_account', 'Unknown')}`\n"
-                f"   💰 Current Month Cost: `{billing_info.get('current_month_cost', 'Not available')}`\n\n"
+                f"💳 <b>Billing Details</b>\n"
+                f"   🔌 Billing Enabled: <code>{'Yes' if billing_info.get('billing_enabled') else 'No'}</code>\n"
+                f"   🏦 Billing Account: <code>{escape_html(billing_info.get('billing_account', 'Unknown'))}</code>\n"
+                f"   💰 Current Month Cost: <code>{escape_html(billing_info.get('current_month_cost', 'Not available'))}</code>\n\n"
             )
             
             # Add cost optimization tips
             billing_text += (
-                "💡 **Cost Optimization Tips**\n"
+                "💡 <b>Cost Optimization Tips</b>\n"
                 "• Use preemptible instances for non-critical workloads\n"
                 "• Enable autoscaling to scale down during low usage\n"
                 "• Monitor and optimize storage usage\n"
                 "• Use committed use discounts for predictable workloads\n"
             )
             
-            # Add inline buttons
-            keyboard = [
-                [InlineKeyboardButton("📊 Clusters", callback_data="clusters")],
-                [InlineKeyboardButton("🖥️ Nodes", callback_data="nodes")],
-                [InlineKeyboardButton("📈 Cost Analysis", callback_data="costs")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            await message.edit_text(billing_text, reply_markup=reply_markup, parse_mode='Markdown')
+            await message.edit_text(billing_text, reply_markup=BILLING_KEYBOARD, parse_mode='HTML')
             
         except Exception as e:
             logger.error(f"Error handling billing command: {e}")
@@ -126,60 +174,43 @@ class BotHandlers:
             message = await update.effective_message.reply_text("🖥️ Fetching node information...")
             
             # Get clusters first to show node pools
-            clusters = self.gcloud_client.get_clusters()
+            clusters = await asyncio.get_running_loop().run_in_executor(None, self.gcloud_client.get_clusters)
             
             if not clusters:
                 await message.edit_text("❌ No clusters found to retrieve node information.")
                 return
             
             # Format nodes information
-            nodes_text = "🖥️ **Cluster Nodes Overview**\n\n"
+            nodes_text = "🖥️ <b>Cluster Nodes Overview</b>\n\n"
             
-            for i, cluster in enumerate(clusters, 1):
-                nodes_text += f"**Cluster {i}: {cluster.get('name', 'Unknown')}**\n"
-                
-                # Get node pools for this cluster
-                node_pools = self.gcloud_client.get_cluster_nodes(
-                    cluster.get('name', ''), 
-                    cluster.get('location', '')
-                )
+            # Get node pools for all clusters concurrently
+            clusters_node_pools = await self._get_clusters_node_pools(clusters)
+            
+            for i, (cluster, node_pools) in enumerate(zip(clusters, clusters_node_pools), 1):
+                nodes_text += f"<b>Cluster {i}: {escape_html(cluster.name)}</b>\n"
                 
                 if node_pools:
                     for j, node_pool in enumerate(node_pools, 1):
                         status_emoji = self._get_status_emoji(node_pool.get('status', 'UNKNOWN'))
-                        nodes_text += (
-                            f"  {j}. **{node_pool.get('name', 'Unknown')}** {status_emoji}\n"
-                            f"     🔢 Version: `{node_pool.get('version', 'Unknown')}`\n"
-                            f"     🚦 Status: `{node_pool.get('status', 'Unknown')}`\n"
-                            f"     🖥️ Node Count: `{node_pool.get('node_count', 'Unknown')}`\n"
-                            f"     💻 Machine Type: `{node_pool.get('machine_type', 'Unknown')}`\n"
-                            f"     💾 Disk Size: `{node_pool.get('disk_size_gb', 'Unknown')} GB`\n"
-                            f"     🖼️ Image Type: `{node_pool.get('image_type', 'Unknown')}`\n"
+                        nodes_text += NODE_POOL_ENTRY_TEMPLATE.format_map(
+                            HtmlTemplateFields(node_pool, index=j, status_emoji=status_emoji)
                         )
                         
                         # Autoscaling information
                         autoscaling = node_pool.get('autoscaling', {})
                         if autoscaling.get('enabled'):
                             nodes_text += (
-                                f"     📈 Autoscaling: `Enabled` "
+                                f"     📈 Autoscaling: <code>Enabled</code> "
                                 f"({autoscaling.get('min_node_count', '?')}-{autoscaling.get('max_node_count', '?')})\n"
                             )
                         else:
-                            nodes_text += "     📈 Autoscaling: `Disabled`\n"
+                            nodes_text += "     📈 Autoscaling: <code>Disabled</code>\n"
                         
                         nodes_text += "\n"
                 else:
                     nodes_text += "  ❌ No node pools found\n\n"
             
-            # Add inline buttons
-            keyboard = [
-                [InlineKeyboardButton("📊 Clusters", callback_data="clusters")],
-                [InlineKeyboardButton("💰 Billing", callback_data="billing")],
-                [InlineKeyboardButton("🔍 Status", callback_data="status")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            await message.edit_text(nodes_text, reply_markup=reply_markup, parse_mode='Markdown')
+            await message.edit_text(nodes_text, reply_markup=NODES_KEYBOARD, parse_mode='HTML')
             
         except Exception as e:
             logger.error(f"Error handling nodes command: {e}")
@@ -193,21 +224,24 @@ class BotHandlers:
             # Send initial message
             message = await update.effective_message.reply_text("📈 Analyzing costs...")
             
-            # Get clusters and billing info for cost analysis
-            clusters = self.gcloud_client.get_clusters()
-            billing_info = self.gcloud_client.get_billing_info()
+            # Get clusters and billing info for cost analysis concurrently
+            loop = asyncio.get_running_loop()
+            clusters, billing_info = await asyncio.gather(
+                loop.run_in_executor(None, self.gcloud_client.get_clusters),
+                loop.run_in_executor(None, self.gcloud_client.get_billing_info)
+            )
             
             # Format cost analysis
-            costs_text = "📈 **Cost Analysis & Optimization**\n\n"
+            costs_text = "📈 <b>Cost Analysis &amp; Optimization</b>\n\n"
             
             # Cluster cost factors
-            costs_text += "🏗️ **Infrastructure Cost Factors**\n"
-            total_nodes = sum(cluster.get('node_count', 0) for cluster in clusters)
-            costs_text += f"   🖥️ Total Nodes: `{total_nodes}`\n"
-            costs_text += f"   📊 Total Clusters: `{len(clusters)}`\n\n"
+            costs_text += "🏗️ <b>Infrastructure Cost Factors</b>\n"
+            total_nodes = sum(cluster.node_count for cluster in clusters)
+            costs_text += f"   🖥️ Total Nodes: <code>{total_nodes}</code>\n"
+            costs_text += f"   📊 Total Clusters: <code>{len(clusters)}</code>\n\n"
             
             # Cost optimization recommendations
-            costs_text += "💡 **Cost Optimization Recommendations**\n"
+            costs_text += "💡 <b>Cost Optimization Recommendations</b>\n"
             
             if total_nodes > 10:
                 costs_text += "   ⚠️ High node count detected - consider consolidation\n"
@@ -217,18 +251,11 @@ class BotHandlers:
                 costs_text += "   ✅ Node count looks reasonable\n"
             
             # Check for autoscaling
-            autoscaling_enabled = False
-            for cluster in clusters:
-                node_pools = self.gcloud_client.get_cluster_nodes(
-                    cluster.get('name', ''), 
-                    cluster.get('location', '')
-                )
-                for node_pool in node_pools:
-                    if node_pool.get('autoscaling', {}).get('enabled'):
-                        autoscaling_enabled = True
-                        break
-                if autoscaling_enabled:
-                    break
+            autoscaling_enabled = any(
+                node_pool.get('autoscaling', {}).get('enabled')
+                for node_pools in await self._get_clusters_node_pools(clusters)
+                for node_pool in node_pools
+            )
             
             if autoscaling_enabled:
                 costs_text += "   ✅ Autoscaling is enabled - good for cost optimization\n"
@@ -244,7 +271,7 @@ class BotHandlers:
             costs_text += "\n"
             
             # Cost saving tips
-            costs_text += "💰 **Cost Saving Strategies**\n"
+            costs_text += "💰 <b>Cost Saving Strategies</b>\n"
             costs_text += "• Use preemptible instances (up to 80% savings)\n"
             "• Enable autoscaling for variable workloads\n"
             "• Use committed use discounts for stable workloads\n"
@@ -252,15 +279,7 @@ class BotHandlers:
             "• Consider regional vs multi-regional storage\n"
             "• Use Cloud Functions for event-driven workloads\n"
             
-            # Add inline buttons
-            keyboard = [
-                [InlineKeyboardButton("📊 Clusters", callback_data="clusters")],
-                [InlineKeyboardButton("💰 Billing", callback_data="billing")],
-                [InlineKeyboardButton("🖥️ Nodes", callback_data="nodes")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            await message.edit_text(costs_text, reply_markup=reply_markup, parse_mode='Markdown')
+            await message.edit_text(costs_text, reply_markup=OVERVIEW_KEYBOARD, parse_mode='HTML')
             
         except Exception as e:
             logger.error(f"Error handling costs command: {e}")
@@ -274,75 +293,70 @@ class BotHandlers:
             # Send initial message
             message = await update.effective_message.reply_text("🔍 Checking system status...")
             
-            # Test GCloud connection
-            connection_status = self.gcloud_client.test_connection()
+            # Get basic information concurrently
+            loop = asyncio.get_running_loop()
+            clusters, project_info, billing_info = await asyncio.gather(
+                loop.run_in_executor(None, self.gcloud_client.get_clusters),
+                loop.run_in_executor(None, self.gcloud_client.get_project_info),
+                loop.run_in_executor(None, self.gcloud_client.get_billing_info)
+            )
             
-            # Get basic information
-            clusters = self.gcloud_client.get_clusters()
-            project_info = self.gcloud_client.get_project_info()
-            billing_info = self.gcloud_client.get_billing_info()
+            # The project lookup doubles as the connection test
+            connection_status = 'error' not in project_info
             
             # Format status information
-            status_text = "🔍 **System Status Overview**\n\n"
+            status_text = "🔍 <b>System Status Overview</b>\n\n"
             
             # Connection status
             if connection_status:
-                status_text += "✅ **GCloud Connection**: `Connected`\n"
+                status_text += "✅ <b>GCloud Connection</b>: <code>Connected</code>\n"
             else:
-                status_text += "❌ **GCloud Connection**: `Failed`\n"
+                status_text += "❌ <b>GCloud Connection</b>: <code>Failed</code>\n"
             
             # Project status
-            if 'error' not in project_info:
-                status_text += f"✅ **Project**: `{project_info.get('project_id', 'Unknown')}`\n"
-                status_text += f"   🚦 State: `{project_info.get('state', 'Unknown')}`\n"
+            if connection_status:
+                status_text += f"✅ <b>Project</b>: <code>{escape_html(project_info.get('project_id', 'Unknown'))}</code>\n"
+                status_text += f"   🚦 State: <code>{escape_html(project_info.get('state', 'Unknown'))}</code>\n"
             else:
-                status_text += "❌ **Project**: `Error retrieving project info`\n"
+                status_text += "❌ <b>Project</b>: <code>Error retrieving project info</code>\n"
+            
+            # Count clusters by status in a single pass
+            status_counts = {}
+            for cluster in clusters:
+                status = cluster.status
+                status_counts[status] = status_counts.get(status, 0) + 1
             
             # Clusters status
             if clusters:
-                status_text += f"✅ **Clusters**: `{len(clusters)} found`\n"
-                
-                # Count clusters by status
-                status_counts = {}
-                for cluster in clusters:
-                    status = cluster.get('status', 'UNKNOWN')
-                    status_counts[status] = status_counts.get(status, 0) + 1
+                status_text += f"✅ <b>Clusters</b>: <code>{len(clusters)} found</code>\n"
                 
                 for status, count in status_counts.items():
                     status_emoji = self._get_status_emoji(status)
-                    status_text += f"   {status_emoji} {status}: `{count}`\n"
+                    status_text += f"   {status_emoji} {escape_html(status)}: <code>{count}</code>\n"
             else:
-                status_text += "⚠️ **Clusters**: `No clusters found`\n"
+                status_text += "⚠️ <b>Clusters</b>: <code>No clusters found</code>\n"
             
             # Billing status
             if 'error' not in billing_info:
                 billing_enabled = billing_info.get('billing_enabled', False)
-                status_text += f"{'✅' if billing_enabled else '⚠️'} **Billing**: `{'Enabled' if billing_enabled else 'Disabled'}`\n"
+                status_text += f"{'✅' if billing_enabled else '⚠️'} <b>Billing</b>: <code>{'Enabled' if billing_enabled else 'Disabled'}</code>\n"
             else:
-                status_text += "❌ **Billing**: `Error retrieving billing info`\n"
+                status_text += "❌ <b>Billing</b>: <code>Error retrieving billing info</code>\n"
             
             status_text += "\n"
             
             # Overall health assessment
-            if connection_status and clusters and 'error' not in project_info:
-                if any(cluster.get('status') == 'RUNNING' for cluster in clusters):
-                    status_text += "🟢 **Overall Status**: `Healthy`\n"
+            if connection_status and clusters:
+                if status_counts.get('RUNNING'):
+                    status_text += "🟢 <b>Overall Status</b>: <code>Healthy</code>\n"
                 else:
-                    status_text += "🟡 **Overall Status**: `Warning - No running clusters`\n"
+                    status_text += "🟡 <b>Overall Status</b>: <code>Warning - No running clusters</code>\n"
             elif not connection_status:
-                status_text += "🔴 **Overall Status**: `Critical - Connection failed`\n"
+                status_text += "🔴 <b>Overall Status</b>: <code>Critical - Connection failed</code>\n"
             else:
-                status_text += "🟡 **Overall Status**: `Warning - Some issues detected`\n"
+                status_text += "🟡 <b>Overall Status</b>: <code>Warning - Some issues detected</code>\n"
             
-            # Add inline buttons
-            keyboard = [
-                [InlineKeyboardButton("📊 Clusters", callback_data="clusters")],
-                [InlineKeyboardButton("💰 Billing", callback_data="billing")],
-                [InlineKeyboardButton("🖥️ Nodes", callback_data="nodes")]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            
-            await message.edit_text(status_text, reply_markup=reply_markup, parse_mode='Markdown')
+            await message.edit_text(status_text, reply_markup=OVERVIEW_KEYBOARD, parse_mode='HTML')
             
         except Exception as e:
             logger.error(f"Error handling status command: {e}")
@@ -350,18 +364,23 @@ class BotHandlers:
                 f"❌ Error checking system status: {str(e)}"
             )
     
-    def _get_status_emoji(self, status: str) -> str:
+    async def _get_clusters_node_pools(self, clusters: Tuple[ClusterInfo, ...]) -> List[Tuple[Mapping[str, Any], ...]]:
+        """Fetch node pools for every cluster concurrently, in the same order as clusters"""
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_NODE_REQUESTS)
+        loop = asyncio.get_running_loop()
+        
+        async def fetch_node_pools(cluster: ClusterInfo) -> Tuple[Mapping[str, Any], ...]:
+            async with semaphore:
+                return await loop.run_in_executor(
+                    None,
+                    self.gcloud_client.get_cluster_nodes,
+                    cluster.name,
+                    cluster.location
+                )
+        
+        return await asyncio.gather(*(fetch_node_pools(cluster) for cluster in clusters))
+    
+    @staticmethod
+    def _get_status_emoji(status: str) -> str:
         """Get appropriate emoji for cluster/node status"""
-        status = status.upper()
-        if status == 'RUNNING':
-            return '🟢'
-        elif status == 'PROVISIONING':
-            return '🟡'
-        elif status == 'STOPPING':
-            return '🟠'
-        elif status == 'ERROR':
-            return '🔴'
-        elif status == 'DEGRADED':
-            return '🟡'
-        else:
-            return '⚪'
+        return STATUS_EMOJI.get(status.upper() if status else '', '⚪')
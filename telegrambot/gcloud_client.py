@@ -5,14 +5,35 @@ Google Cloud Client for Cluster and Billing Information
 
 import os
 import logging
-from typing import Dict, List, Optional, Any
+import random
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Mapping, NamedTuple, Optional, Tuple, Any
 from datetime import datetime, timedelta
+from types import MappingProxyType
+from cachetools import TTLCache
 from google.cloud import container_v1, billing_v1, resourcemanager_v3
 from google.auth import default
+from google.auth.transport.requests import Request
 from google.auth.exceptions import DefaultCredentialsError
 
 logger = logging.getLogger(__name__)
 
+class ClusterInfo(NamedTuple):
+    """Immutable snapshot of a GKE cluster, safe to share through the cache"""
+    name: str
+    location: str
+    status: str
+    version: str
+    node_count: int
+    max_pods_per_node: int
+    network: str
+    subnetwork: str
+    created_at: Optional[str]
+    endpoint: str
+    master_auth: Mapping[str, Any]
+
 class GCloudClient:
     def __init__(self):
         """Initialize Google Cloud client with authentication"""
@@ -20,15 +41,28 @@ class GCloudClient:
         if not self.project_id:
             raise ValueError("GOOGLE_CLOUD_PROJECT_ID environment variable is required")
         
+        # Clusters and node pools change rarely, so serve repeated lookups from short-lived caches
+        self._clusters_cache = TTLCache(maxsize=1, ttl=60)
+        self._node_cache = TTLCache(maxsize=128, ttl=60)
+        self._cache_lock = threading.Lock()
+        self._clusters_fetch: Optional[Future] = None
+        
         try:
             # Initialize credentials
             self.credentials, _ = default()
             
+            # Fetch the access token now instead of on the first RPC, then keep it fresh
+            refreshed = self._refresh_credentials()
+            self._start_credentials_refresher(refreshed)
+            
             # Initialize clients
             self.container_client = container_v1.ClusterManagerClient(credentials=self.credentials)
             self.billing_client = billing_v1.CloudBillingClient(credentials=self.credentials)
             self.resource_client = resourcemanager_v3.ProjectsClient(credentials=self.credentials)
             
+            # Open the API channels up front so the first command doesn't pay the handshake
+            self._warm_up_channels()
+            
             logger.info(f"Successfully initialized GCloud client for project: {self.project_id}")
             
         except DefaultCredentialsError as e:
@@ -38,69 +72,202 @@ class GCloudClient:
             logger.error(f"Failed to initialize GCloud client: {e}")
             raise
     
-    def get_clusters(self) -> List[Dict[str, Any]]:
+    def _refresh_credentials(self) -> bool:
+        """Refresh the access token, returning whether it succeeded"""
+        try:
+            self.credentials.refresh(Request())
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to refresh Google Cloud credentials: {e}")
+            return False
+    
+    def _start_credentials_refresher(self, refreshed: bool):
+        """Refresh credentials in a daemon thread shortly before they expire"""
+        thread = threading.Thread(
+            target=self._credentials_refresh_loop,
+            args=(refreshed,),
+            name='gcloud-credentials-refresh',
+            daemon=True
+        )
+        thread.start()
+    
+    def _credentials_refresh_loop(self, refreshed: bool):
+        """Sleep until a minute before token expiry, then refresh, backing off on failure"""
+        backoff = 60
+        while True:
+            if refreshed:
+                expiry = self.credentials.expiry
+                if expiry is None:
+                    # A successful refresh that sets no expiry means the token never expires
+                    return
+                
+                backoff = 60
+                delay = (expiry - datetime.utcnow() - timedelta(seconds=60)).total_seconds()
+                time.sleep(max(delay, 0))
+            else:
+                # Exponential backoff capped at 15 minutes, with jitter so retries don't align
+                time.sleep(backoff * random.uniform(0.8, 1.2))
+                backoff = min(900, backoff * 2)
+            
+            refreshed = self._refresh_credentials()
+    
+    def _warm_up_channels(self):
+        """Issue one cheap call per API client in the background to establish its channel"""
+        project_name = f"projects/{self.project_id}"
+        warm_up_calls = {
+            'resourcemanager': lambda: self.resource_client.get_project(name=project_name),
+            # Routed through get_clusters so the response primes the cluster cache
+            'container': self.get_clusters,
+            'billing': lambda: self.billing_client.get_project_billing_info(name=project_name),
+        }
+        
+        executor = ThreadPoolExecutor(max_workers=len(warm_up_calls), thread_name_prefix='gcloud-warmup')
+        for api, call in warm_up_calls.items():
+            executor.submit(self._warm_up_call, api, call)
+        executor.shutdown(wait=False)
+    
+    @staticmethod
+    def _warm_up_call(api: str, call):
+        """Run a single warm-up call; failures are surfaced later by the real request"""
+        try:
+            call()
+            logger.debug(f"Warmed up {api} channel")
+        except Exception as e:
+            logger.warning(f"Failed to warm up {api} channel: {e}")
+    
+    @staticmethod
+    def _master_auth_to_dict(master_auth) -> Dict[str, Any]:
+        """Convert a cluster's MasterAuth message to the dict shape used in cluster info"""
+        if not master_auth:
+            return {'username': None, 'client_certificate_config': False}
+        
+        cert_config = master_auth.client_certificate_config
+        return {
+            'username': master_auth.username,
+            'client_certificate_config': cert_config.enabled if cert_config else False
+        }
+    
+    @staticmethod
+    def _addons_config_to_dict(addons_config) -> Dict[str, bool]:
+        """Report whether each addon is disabled, treating unset addons as disabled"""
+        if not addons_config:
+            return {
+                'http_load_balancing': True,
+                'horizontal_pod_autoscaling': True,
+                'kubernetes_dashboard': True
+            }
+        
+        http_load_balancing = addons_config.http_load_balancing
+        horizontal_pod_autoscaling = addons_config.horizontal_pod_autoscaling
+        kubernetes_dashboard = addons_config.kubernetes_dashboard
+        return {
+            'http_load_balancing': http_load_balancing.disabled if http_load_balancing else True,
+            'horizontal_pod_autoscaling': horizontal_pod_autoscaling.disabled if horizontal_pod_autoscaling else True,
+            'kubernetes_dashboard': kubernetes_dashboard.disabled if kubernetes_dashboard else True
+        }
+    
+    def get_clusters(self) -> Tuple[ClusterInfo, ...]:
         """Get all GKE clusters in the project"""
+        # Concurrent callers share the outcome of a single in-flight fetch, successful or not
+        with self._cache_lock:
+            cached_clusters = self._clusters_cache.get('clusters')
+            if cached_clusters is not None:
+                return cached_clusters
+            
+            in_flight = self._clusters_fetch
+            if in_flight is None:
+                self._clusters_fetch = Future()
+        
+        if in_flight is not None:
+            return in_flight.result()
+        
+        clusters = ()
+        try:
+            clusters = self._fetch_clusters()
+        finally:
+            # Release waiters even if the fetch failed; later callers start a fresh fetch
+            with self._cache_lock:
+                fetch, self._clusters_fetch = self._clusters_fetch, None
+            fetch.set_result(clusters)
+        return clusters
+    
+    def _fetch_clusters(self) -> Tuple[ClusterInfo, ...]:
+        """List clusters from the API, caching the result on success"""
         try:
             parent = f"projects/{self.project_id}/locations/-"
             request = container_v1.ListClustersRequest(parent=parent)
             
-            clusters = []
-            for cluster in self.container_client.list_clusters(request=request):
-                cluster_info = {
-                    'name': cluster.name,
-                    'location': cluster.location,
-                    'status': cluster.status.name,
-                    'version': cluster.current_master_version,
-                    'node_count': cluster.current_node_count,
-                    'machine_type': cluster.default_max_pods_per_node,
-                    'network': cluster.network,
-                    'subnetwork': cluster.subnetwork,
-                    'created_at': cluster.create_time.isoformat() if cluster.create_time else None,
-                    'endpoint': cluster.endpoint,
-                    'master_auth': {
-                        'username': cluster.master_auth.username if cluster.master_auth else None,
-                        'client_certificate_config': cluster.master_auth.client_certificate_config.enabled if cluster.master_auth and cluster.master_auth.client_certificate_config else False
-                    }
-                }
-                clusters.append(cluster_info)
+            # A tuple, so the cached result can be shared safely between callers
+            clusters = tuple(
+                ClusterInfo(
+                    name=cluster.name,
+                    location=cluster.location,
+                    status=cluster.status.name,
+                    version=cluster.current_master_version,
+                    node_count=cluster.current_node_count,
+                    max_pods_per_node=cluster.default_max_pods_per_node,
+                    network=cluster.network,
+                    subnetwork=cluster.subnetwork,
+                    # Cluster.create_time is already an RFC3339 string, not a Timestamp
+                    created_at=cluster.create_time or None,
+                    endpoint=cluster.endpoint,
+                    master_auth=MappingProxyType(self._master_auth_to_dict(cluster.master_auth))
+                )
+                for cluster in self.container_client.list_clusters(request=request).clusters
+            )
             
             logger.info(f"Retrieved {len(clusters)} clusters")
+            with self._cache_lock:
+                self._clusters_cache['clusters'] = clusters
             return clusters
-            
+        
         except Exception as e:
             logger.error(f"Failed to get clusters: {e}")
-            return []
+            return ()
     
-    def get_cluster_nodes(self, cluster_name: str, location: str) -> List[Dict[str, Any]]:
+    def get_cluster_nodes(self, cluster_name: str, location: str) -> Tuple[Mapping[str, Any], ...]:
         """Get node information for a specific cluster"""
+        cache_key = (cluster_name, location)
+        with self._cache_lock:
+            cached_nodes = self._node_cache.get(cache_key)
+        if cached_nodes is not None:
+            return cached_nodes
+        
         try:
             parent = f"projects/{self.project_id}/locations/{location}/clusters/{cluster_name}"
             request = container_v1.ListNodePoolsRequest(parent=parent)
             
+            # Read-only entries in a tuple, so the cached result can be shared safely between callers
             nodes = []
-            for node_pool in self.container_client.list_node_pools(request=request):
-                node_info = {
+            for node_pool in self.container_client.list_node_pools(request=request).node_pools:
+                # Read each nested message once instead of per field
+                config = node_pool.config
+                autoscaling = node_pool.autoscaling
+                node_info = MappingProxyType({
                     'name': node_pool.name,
                     'version': node_pool.version,
                     'status': node_pool.status.name,
                     'node_count': node_pool.initial_node_count,
-                    'machine_type': node_pool.config.machine_type if node_pool.config else None,
-                    'disk_size_gb': node_pool.config.disk_size_gb if node_pool.config else None,
-                    'image_type': node_pool.config.image_type if node_pool.config else None,
-                    'autoscaling': {
-                        'enabled': node_pool.autoscaling.enabled if node_pool.autoscaling else False,
-                        'min_node_count': node_pool.autoscaling.min_node_count if node_pool.autoscaling else None,
-                        'max_node_count': node_pool.autoscaling.max_node_count if node_pool.autoscaling else None
-                    }
-                }
+                    'machine_type': config.machine_type if config else None,
+                    'disk_size_gb': config.disk_size_gb if config else None,
+                    'image_type': config.image_type if config else None,
+                    'autoscaling': MappingProxyType({
+                        'enabled': autoscaling.enabled if autoscaling else False,
+                        'min_node_count': autoscaling.min_node_count if autoscaling else None,
+                        'max_node_count': autoscaling.max_node_count if autoscaling else None
+                    })
+                })
                 nodes.append(node_info)
+            nodes = tuple(nodes)
             
             logger.info(f"Retrieved {len(nodes)} node pools for cluster {cluster_name}")
+            with self._cache_lock:
+                self._node_cache[cache_key] = nodes
             return nodes
             
         except Exception as e:
             logger.error(f"Failed to get nodes for cluster {cluster_name}: {e}")
-            return []
+            return ()
     
     def get_billing_info(self) -> Dict[str, Any]:
         """Get current billing information"""
@@ -165,21 +332,14 @@ class GCloudClient:
                 'version': cluster.current_master_version,
                 'node_count': cluster.current_node_count,
                 'endpoint': cluster.endpoint,
-                'master_auth': {
-                    'username': cluster.master_auth.username if cluster.master_auth else None,
-                    'client_certificate_config': cluster.master_auth.client_certificate_config.enabled if cluster.master_auth and cluster.master_auth.client_certificate_config else False
-                },
+                'master_auth': self._master_auth_to_dict(cluster.master_auth),
                 'network_config': {
                     'network': cluster.network,
                     'subnetwork': cluster.subnetwork,
                     'enable_kubernetes_alpha': cluster.enable_kubernetes_alpha,
                     'enable_legacy_abac': cluster.enable_legacy_abac
                 },
-                'addons_config': {
-                    'http_load_balancing': cluster.addons_config.http_load_balancing.disabled if cluster.addons_config and cluster.addons_config.http_load_balancing else True,
-                    'horizontal_pod_autoscaling': cluster.addons_config.horizontal_pod_autoscaling.disabled if cluster.addons_config and cluster.addons_config.horizontal_pod_autoscaling else True,
-                    'kubernetes_dashboard': cluster.addons_config.kubernetes_dashboard.disabled if cluster.addons_config and cluster.addons_config.kubernetes_dashboard else True
-                }
+                'addons_config': self._addons_config_to_dict(cluster.addons_config)
             }
             
             logger.info(f"Retrieved status for cluster {cluster_name}")
@@ -200,11 +360,6 @@ class GCloudClient:
         }
     
     def test_connection(self) -> bool:
-        """Test if the GCloud client can connect and authenticate"""
-        try:
-            # Try to get project info as a connection test
-            self.get_project_info()
-            return True
-        except Exception as e:
-            logger.error(f"Connection test failed: {e}")
-            return False
+        """Test if the GCloud client can connect and authenticate (used by test_setup.py)"""
+        # get_project_info reports failures as an 'error' entry rather than raising
+        return 'error' not in self.get_project_info()
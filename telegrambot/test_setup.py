@@ -3,22 +3,77 @@
 Test script to verify Google Cloud connection and bot setup
 """
 
+import io
 import os
 import sys
+import threading
+import importlib
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from dotenv import load_dotenv
 
+# Modules checked by test_imports, grouped by the package that provides them
+REQUIRED_MODULES = [
+    ("python-telegram-bot", ("telegram",)),
+    ("Google Cloud modules", (
+        "google.cloud.container_v1",
+        "google.cloud.billing_v1",
+        "google.cloud.resourcemanager_v3",
+    )),
+    ("Google Auth", ("google.auth",)),
+    ("python-dotenv", ("dotenv",)),
+]
+
+@lru_cache(maxsize=None)
+def _has_module(name):
+    """Check whether a module is installed without executing it"""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except ModuleNotFoundError:
+        # A missing parent package raises instead of returning None
+        return False
+
+class ThreadLocalStdout:
+    """Stand-in for sys.stdout that sends each thread's output to its own buffer"""
+    
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+    
+    def capture(self):
+        """Start buffering output written by the current thread"""
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
+    
+    def write(self, text):
+        return getattr(self._local, 'buffer', self.stream).write(text)
+    
+    def flush(self):
+        getattr(self._local, 'buffer', self.stream).flush()
+    
+    def __getattr__(self, name):
+        # Everything else (encoding, isatty, fileno, ...) comes from the real stream
+        return getattr(self.stream, name)
+
+def _import_attr(module_name, attr):
+    """Import a module and return one of its attributes"""
+    # import_module checks sys.modules itself and waits for an import in progress on another thread
+    return getattr(importlib.import_module(module_name), attr)
+
 def test_environment():
     """Test if environment variables are properly set"""
     print("🔍 Testing environment configuration...")
     
-    # Load environment variables
+    # Load environment variables and snapshot them once
     load_dotenv()
+    env = os.environ.copy()
     
     required_vars = ['TELEGRAM_BOT_TOKEN', 'GOOGLE_CLOUD_PROJECT_ID']
     missing_vars = []
     
     for var in required_vars:
-        value = os.getenv(var)
+        value = env.get(var)
         if not value or value.startswith('your_'):
             missing_vars.append(var)
             print(f"❌ {var}: Not set or using placeholder value")
@@ -34,36 +89,15 @@ def test_environment():
     return True
 
 def test_imports():
-    """Test if all required modules can be imported"""
+    """Test if all required modules are installed"""
     print("\n🔍 Testing module imports...")
     
-    try:
-        import telegram
-        print("✅ python-telegram-bot imported successfully")
-    except ImportError as e:
-        print(f"❌ Failed to import python-telegram-bot: {e}")
-        return False
-    
-    try:
-        from google.cloud import container_v1, billing_v1, resourcemanager_v3
-        print("✅ Google Cloud modules imported successfully")
-    except ImportError as e:
-        print(f"❌ Failed to import Google Cloud modules: {e}")
-        return False
-    
-    try:
-        from google.auth import default
-        print("✅ Google Auth imported successfully")
-    except ImportError as e:
-        print(f"❌ Failed to import Google Auth: {e}")
-        return False
-    
-    try:
-        from dotenv import load_dotenv
-        print("✅ python-dotenv imported successfully")
-    except ImportError as e:
-        print(f"❌ Failed to import python-dotenv: {e}")
-        return False
+    for package_name, module_names in REQUIRED_MODULES:
+        missing = [name for name in module_names if not _has_module(name)]
+        if missing:
+            print(f"❌ Failed to find {package_name}: {', '.join(missing)} not installed")
+            return False
+        print(f"✅ {package_name} found")
     
     print("✅ All module imports test passed")
     return True
@@ -73,7 +107,7 @@ def test_gcloud_connection():
     print("\n🔍 Testing Google Cloud connection...")
     
     try:
-        from gcloud_client import GCloudClient
+        GCloudClient = _import_attr("gcloud_client", "GCloudClient")
         
         # Test connection
         client = GCloudClient()
@@ -93,7 +127,7 @@ def test_bot_handlers():
     print("\n🔍 Testing bot handlers...")
     
     try:
-        from bot_handlers import BotHandlers
+        _import_attr("bot_handlers", "BotHandlers")
         print("✅ Bot handlers imported successfully")
         return True
     except Exception as e:
@@ -113,14 +147,34 @@ def main():
         ("Bot Handlers", test_bot_handlers)
     ]
     
-    results = []
-    for test_name, test_func in tests:
+    # The connection test reads .env values too, so load them before anything runs
+    load_dotenv()
+    
+    stdout = ThreadLocalStdout(sys.stdout)
+    
+    def run_test(test_name, test_func):
+        """Run one test with its output buffered, returning (result, output)"""
+        output = stdout.capture()
         try:
             result = test_func()
-            results.append((test_name, result))
         except Exception as e:
             print(f"❌ {test_name} test failed with exception: {e}")
-            results.append((test_name, False))
+            result = False
+        return result, output.getvalue()
+    
+    # The tests are independent, so run them concurrently and print their output in order
+    sys.stdout = stdout
+    try:
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [executor.submit(run_test, test_name, test_func) for test_name, test_func in tests]
+        outcomes = [future.result() for future in futures]
+    finally:
+        sys.stdout = stdout.stream
+    
+    results = []
+    for (test_name, _), (result, output) in zip(tests, outcomes):
+        print(output, end='')
+        results.append((test_name, result))
     
     # Summary
     print("\n" + "=" * 55)